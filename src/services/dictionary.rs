@@ -2,6 +2,24 @@ use gtk::glib;
 use rusqlite::{Connection, OpenFlags};
 use std::path::PathBuf;
 
+/// Senses of the first entry for a word, looked up by its lowercased form.
+const SENSES_BY_WORD_LC: &str = "SELECT id, pos, gloss, etymology_text FROM senses
+     WHERE word_id = (
+         SELECT id FROM words
+         WHERE word_lc = ?1 AND lang_code = ?2
+         ORDER BY id LIMIT 1
+     )
+     ORDER BY id";
+
+/// Same lookup for databases built before `words` was keyed on `word_lc`,
+/// which only store the original spelling.
+const SENSES_BY_WORD_NOCASE: &str = "SELECT id, pos, gloss, etymology_text FROM senses
+     WHERE word_id = (
+         SELECT id FROM words
+         WHERE word = ?1 COLLATE NOCASE AND lang_code = ?2 LIMIT 1
+     )
+     ORDER BY id";
+
 /// The language mode for dictionary lookups.
 #[derive(Debug, Clone, Copy, Default)]
 pub enum Language {
@@ -70,23 +88,19 @@ pub fn lookup(word: &str, lang: Language) -> Option<LookupResult> {
     let conn = open_db()?;
     let lang_code = lang.code();
     let target_lang = lang.translation_target();
-
-    // Find the word in the words table
-    let word_id: i64 = conn
-        .query_row(
-            "SELECT id FROM words WHERE word = ?1 COLLATE NOCASE AND lang_code = ?2 LIMIT 1",
-            [word, lang_code],
-            |row| row.get(0),
-        )
-        .ok()?;
-
-    // Get all senses for this word
-    let mut sense_stmt = conn
-        .prepare("SELECT id, pos, gloss, etymology_text FROM senses WHERE word_id = ?1 ORDER BY id")
-        .ok()?;
+    // Words are stored lowercased (see scripts/jsonl_to_sqlite.py)
+    let word_lc = word.to_lowercase();
+
+    // Get all senses of the first matching word, resolving the word id in
+    // the same query. Preparing fails on databases without `word_lc`, which
+    // are still searched by the original spelling.
+    let (mut sense_stmt, key) = match conn.prepare(SENSES_BY_WORD_LC) {
+        Ok(stmt) => (stmt, word_lc.as_str()),
+        Err(_) => (conn.prepare(SENSES_BY_WORD_NOCASE).ok()?, word),
+    };
 
     let senses: Vec<Sense> = sense_stmt
-        .query_map([word_id], |row| {
+        .query_map([key, lang_code], |row| {
             let sense_id: i64 = row.get(0)?;
             let pos: String = row.get(1)?;
             let gloss: String = row.get(2)?;